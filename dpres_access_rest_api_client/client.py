@@ -26,12 +26,21 @@ SearchResult = collections.namedtuple(
     ("results", "prev_url", "next_url")
 )
 
+# File formats in which ingest reports can be retrieved
+_INGEST_REPORT_FILE_TYPES = frozenset(("xml", "html"))
 
-def get_poll_interval_iter():
+
+def get_poll_interval_iter(rng=None):
     """
     Return an iterator that can be iterated for poll intervals. This takes
     care of ramping up the poll interval for longer dissemination tasks.
+
+    :param rng: Optional `random.Random` instance used for the jitter.
+                The module-level generator of `random` is used by default.
     """
+    if rng is None:
+        rng = random
+
     # First five requests use 3s intervals,
     # second five use 10s intervals,
     # and all subsequent intervals are 60s
@@ -47,7 +56,26 @@ def get_poll_interval_iter():
         # Return interval with some additional jitter to ensure multiple
         # requests are not sent at the same time
         # (aka the thundering herd problem).
-        yield last_interval + (random.random() * 0.5)  # nosec
+        yield last_interval + (rng.random() * 0.5)  # nosec
+
+
+def _parse_utc_timestamp(timestamp):
+    """
+    Parse a UTC timestamp returned by the API into a timezone-aware
+    datetime.
+
+    The API returns timestamps in the 'YYYY-MM-DDTHH:MM:SSZ' format. A
+    '+00:00' suffix is accepted in place of 'Z'.
+
+    :raises ValueError: If the timestamp is not in the expected format or is
+                        not in UTC
+    """
+    if timestamp[19:] not in ("Z", "+00:00"):
+        raise ValueError(f"Invalid UTC timestamp '{timestamp}'")
+
+    return datetime.strptime(
+        timestamp[:19], "%Y-%m-%dT%H:%M:%S"
+    ).replace(tzinfo=timezone.utc)
 
 
 class AccessClient:
@@ -211,15 +239,15 @@ class AccessClient:
         data = response.json()["data"]
         return data["deleted"] == "true"
 
-    def get_ingest_report_entries(self, sip_id):
+    def _get_ingest_report_results(self, sip_id):
         """
-        Get all the ingest report entries created for a package.
+        Get the ingest report listing of a package as returned by the API.
 
         :param sip_id: SIP identifier of the package
 
-        :returns: Entries of all ingest reports created for a package as a list
-                  of dicts. Returns an empty list if there are no ingest
-                  reports available, or if the given SIP id cannot be found.
+        :returns: List of ingest report results, or an empty list if there
+                  are no ingest reports available or if the given SIP id
+                  cannot be found.
         """
         sip_id = quote(sip_id, safe="")
         url = f"{self.base_url}/ingest/report/{sip_id}"
@@ -232,15 +260,25 @@ class AccessClient:
                 return []
             raise
 
-        entries = response.json()["data"]["results"]
+        return response.json()["data"]["results"]
+
+    def get_ingest_report_entries(self, sip_id):
+        """
+        Get all the ingest report entries created for a package.
+
+        :param sip_id: SIP identifier of the package
+
+        :returns: Entries of all ingest reports created for a package as a list
+                  of dicts. Returns an empty list if there are no ingest
+                  reports available, or if the given SIP id cannot be found.
+        """
+        entries = self._get_ingest_report_results(sip_id)
 
         # Modify entries to be more user-friendly
         for entry in entries:
             entry.pop("download")
             entry["transfer_id"] = entry.pop("id")
-            entry["date"] = datetime.strptime(entry["date"],
-                                              '%Y-%m-%dT%H:%M:%SZ')
-            entry["date"] = entry["date"].replace(tzinfo=timezone.utc)
+            entry["date"] = _parse_utc_timestamp(entry["date"])
         entries = sorted(entries, key=lambda entry: entry["date"],
                          reverse=True)
 
@@ -258,7 +296,7 @@ class AccessClient:
                   ingest report is found for the given SIP and transfer
                   identifiers or if the identifiers are faulty.
         """
-        if file_type not in ["xml", "html"]:
+        if file_type not in _INGEST_REPORT_FILE_TYPES:
             raise ValueError(f"Invalid file type '{file_type}': Only 'xml' "
                              "and 'html' file formats are accepted")
 
@@ -287,13 +325,16 @@ class AccessClient:
         :returns: The latest ingest report created for the package as a byte
                   string, or None if no reports are found
         """
-        report_entries = self.get_ingest_report_entries(sip_id)
+        results = self._get_ingest_report_results(sip_id)
 
-        if not report_entries:
+        if not results:
             return None
 
-        latest = max(report_entries, key=lambda entry: entry["date"])
-        return self.get_ingest_report(sip_id, latest["transfer_id"], file_type)
+        # Find the latest report without sorting or rewriting the entries
+        latest = max(
+            results, key=lambda result: _parse_utc_timestamp(result["date"])
+        )
+        return self.get_ingest_report(sip_id, latest["id"], file_type)
 
 
 class DIPRequest:
@@ -19,7 +19,6 @@ BuildRoot:      %{_tmppath}/%{name}-%{version}-%{release}-root-%(%{__id_u} -n)
 BuildArch:      noarch
 BuildRequires:  python3-setuptools
 BuildRequires:  python36-pytest
-BuildRequires:  python3-requests-mock
 BuildRequires:  python36-setuptools_scm
 Requires:       python3
 Requires:       python3-setuptools
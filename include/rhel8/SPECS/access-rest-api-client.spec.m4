@@ -20,7 +20,6 @@ BuildArch:      noarch
 BuildRequires:  python3-setuptools
 BuildRequires:  python3-pytest
 BuildRequires:  python3-setuptools_scm
-BuildRequires:  python3-requests-mock
 Requires:       python3
 Requires:       python3-setuptools
 Requires:       python3-requests
@@ -25,7 +25,6 @@ BuildRequires:  %{py3_dist setuptools}
 BuildRequires:  %{py3_dist setuptools-scm}
 BuildRequires:  %{py3_dist wheel}
 BuildRequires:  %{py3_dist pytest}
-BuildRequires:  %{py3_dist requests-mock}
 
 %py_provides python3-dpres-access-rest-api-client
 
@@ -0,0 +1,58 @@
+"""
+Mocked DPRES Access REST API constants and helpers shared by the tests
+"""
+import json
+
+API_URL = "http://fakeapi/api/2.0/urn:uuid:fake_contract_id"
+DIP_URL = f"{API_URL}/disseminated/spam_dip"
+INGEST_REPORTS_URL = f"{API_URL}/ingest/report/doi%3Afake_id"
+
+DIP_CONTENT = b"This is a complete DIP in a ZIP sent in a blip"
+
+
+def ingest_report_url(transfer_id, file_type):
+    """
+    Return the URL of the ingest report of the 'doi:fake_id' SIP with the
+    given transfer ID and file type
+    """
+    return f"{INGEST_REPORTS_URL}/{transfer_id}?type={file_type}"
+
+
+def json_body(data):
+    """
+    Return mocked response arguments for a JSON body. The body is serialized
+    once instead of on every matched request.
+    """
+    return {
+        "content": json.dumps(data).encode("utf-8"),
+        "headers": {"Content-Type": "application/json"}
+    }
+
+
+def ingest_reports_response(*reports):
+    """
+    Return mocked response arguments for an ingest report listing of the
+    'doi:fake_id' SIP containing the given (transfer ID, date, status)
+    reports
+    """
+    return json_body({
+        "status": "success",
+        "data": {
+            "results": [
+                {
+                    "date": date,
+                    "download": {
+                        "html": ("/api/2.0/urn:uuid:fake_contract_id"
+                                 "/ingest/report/doi:fake_id/"
+                                 f"{transfer_id}?type=html"),
+                        "xml": ("/api/2.0/urn:uuid:fake_contract_id"
+                                "/ingest/report/doi:fake_id/"
+                                f"{transfer_id}?type=xml")
+                    },
+                    "id": transfer_id,
+                    "status": status
+                }
+                for transfer_id, date, status in reports
+            ]
+        }
+    })
@@ -1,48 +1,162 @@
+import http.client
+import io
 from configparser import ConfigParser
-from pathlib import Path
 
 import pytest
-
-
-@pytest.fixture(scope="function")
-def testpath(tmpdir):
+import requests
+from click.testing import CliRunner
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from dpres_access_rest_api_client.cli import cli, Context
+from dpres_access_rest_api_client.client import AccessClient
+from .access_api_mocks import (
+    API_URL, DIP_CONTENT, DIP_URL, INGEST_REPORTS_URL, ingest_report_url,
+    ingest_reports_response, json_body
+)
+
+MOCK_CONFIG = {
+    "dpres": {
+        "contract_id": "urn:uuid:fake_contract_id",
+        "username": "fakeuser",
+        "password": "fakepassword",
+        "verify_ssl": "true",
+        "api_host": "http://fakeapi/"
+    }
+}
+
+DISSEMINATE_RESPONSE = {
+    "status": "success",
+    "data": {
+        "disseminated": (
+            "/api/2.0/urn:uuid:fake_contract_id/disseminated/spam_dip"
+        )
+    }
+}
+DIP_READY_RESPONSE = {
+    "status": "success",
+    "data": {
+        "complete": "true",
+        "actions": {
+            "download": (
+                "/api/2.0/urn:uuid:fake_contract_id/disseminated/spam_dip/"
+                "download"
+            )
+        }
+    }
+}
+DIP_DELETED_RESPONSE = {
+    "status": "success",
+    "data": {
+        "deleted": "true",
+    }
+}
+
+# Response arguments for each (method, URL) registered by `mocked_api`
+MOCKED_API_ROUTES = {
+    # Dissemination of the 'spam' AIP into the ready 'spam_dip' DIP
+    ("POST", f"{API_URL}/preserved/spam/disseminate?format=zip"):
+        json_body(DISSEMINATE_RESPONSE),
+    ("GET", DIP_URL): json_body(DIP_READY_RESPONSE),
+    ("GET", f"{DIP_URL}/download"): {"content": DIP_CONTENT},
+    ("DELETE", DIP_URL): json_body(DIP_DELETED_RESPONSE),
+
+    # Three ingest reports for the 'doi:fake_id' SIP. The newest report
+    # is deliberately not the last one in the listing.
+    ("GET", INGEST_REPORTS_URL): ingest_reports_response(
+        ("fake_transfer_id_1", "2022-01-01T00:00:00Z", "accepted"),
+        ("fake_transfer_id_2", "2022-01-03T00:00:00Z", "rejected"),
+        ("fake_transfer_id_3", "2022-01-02T00:00:00Z", "accepted")
+    ),
+    ("GET", ingest_report_url("fake_transfer_id_1", "html")):
+        {"content": b"oldest ingest report"},
+    ("GET", ingest_report_url("fake_transfer_id_2", "html")):
+        {"content": b"latest ingest report"},
+    ("GET", ingest_report_url("fake_transfer_id_3", "html")):
+        {"content": b"old ingest report"}
+}
+
+
+class StubAdapter(BaseAdapter):
     """
-    Create a temporary test directory
+    Transport adapter that returns canned responses from a route table
+    instead of performing HTTP requests.
+
+    The route table maps a (method, full URL) tuple to the arguments of the
+    response: `status_code`, `json`, `content` and `headers`. Any other key
+    raises a TypeError instead of being silently ignored.
     """
-    # TODO: Replace `testpath` with built-in `tmp_path` in pytest 3.9.0+
-    return Path(str(tmpdir))
+    def __init__(self):
+        super().__init__()
+        self.routes = {}
+
+    # pylint: disable=too-many-arguments,unused-argument
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        """
+        Return the registered response for the prepared request
+        """
+        try:
+            kwargs = self.routes[(request.method, request.url)]
+        except KeyError:
+            raise requests.exceptions.ConnectionError(
+                f"No mocked route for {request.method} {request.url}"
+            ) from None
+
+        return self.build_response(request, **kwargs)
+
+    @staticmethod
+    def build_response(request, status_code=200, content=b"", headers=None,
+                       json=None):
+        """
+        Build a `requests.Response` for the prepared request. The body is
+        served from an in-memory stream, so streamed downloads work as well.
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        if json is not None:
+            content = json_body(json)["content"]
+            headers.setdefault("Content-Type", "application/json")
+        headers.setdefault("Content-Length", str(len(content)))
+
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = http.client.responses.get(status_code, "")
+        response.headers = headers
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self):
+        """
+        Nothing to clean up
+        """
 
 
 @pytest.fixture(scope="function")
-def home_config_path(testpath, monkeypatch):
+def home_config_path(tmp_path, monkeypatch):
     """
-    Path to the user's configuration file in a mocked home directory
+    Path to the user's configuration file in a mocked home directory.
+    The file itself is not created.
     """
-    home_dir = (testpath / "home" / "testuser")
+    home_dir = (tmp_path / "home" / "testuser")
     monkeypatch.setenv("HOME", str(home_dir))
 
-    config_dir = home_dir / ".config" / "dpres_access_rest_api_client"
-    config_dir.mkdir(parents=True)
-    return config_dir / "config.conf"
+    return home_dir / ".config" / "dpres_access_rest_api_client" / \
+        "config.conf"
 
 
 @pytest.fixture(scope="function", autouse=True)
-def mock_config(monkeypatch, home_config_path):
-    """
-    Create a mock configuration file by mocking the user's home directory
-    and placing a configuration file in the expected place
-    """
-    home_config_path.write_text(
-        "[dpres]\n"
-        "contract_id=urn:uuid:fake_contract_id\n"
-        "username=fakeuser\n"
-        "password=fakepassword\n"
-        "verify_ssl=true\n"
-        "api_host=http://fakeapi/"
-    )
+def mock_config(monkeypatch):
+    """
+    Mock the configuration without touching the file system.
 
+    Each test gets its own configuration built from MOCK_CONFIG, so tests
+    may modify it freely.
+    """
     config = ConfigParser()
-    config.read(str(home_config_path))
+    config.read_dict(MOCK_CONFIG)
 
     monkeypatch.setattr(
         "dpres_access_rest_api_client.client.CONFIG", config
@@ -51,23 +165,27 @@ def mock_config(monkeypatch, home_config_path):
     return config
 
 
+@pytest.fixture(scope="session")
+def click_runner():
+    """
+    Click test runner shared by the whole test session. The runner holds
+    no state between invocations.
+    """
+    return CliRunner()
+
+
 @pytest.fixture(scope="function")
-def cli_runner(mock_config):
+def cli_runner(mock_config, click_runner):
     """
     Run the CLI entrypoint using the provided arguments and return the
     result
     """
-    from click.testing import CliRunner
-    from dpres_access_rest_api_client.cli import cli, Context
-
     def wrapper(args, **kwargs):
         """
         Run the CLI entrypoint using provided arguments and return
         the result.
         """
-        runner = CliRunner()
-
-        result = runner.invoke(
+        result = click_runner.invoke(
             cli, args, obj=Context(), catch_exceptions=False, **kwargs
         )
         return result
@@ -80,8 +198,32 @@ def client(mock_config):
     """
     AccessClient instance
     """
-    from dpres_access_rest_api_client.client import AccessClient
-
     client = AccessClient(config=mock_config)
 
     return client
+
+
+@pytest.fixture(scope="function")
+def fast_http(monkeypatch):
+    """
+    Route every HTTP request to a `StubAdapter` and return its route table.
+    Routes are registered by adding entries to the returned dict.
+    """
+    adapter = StubAdapter()
+    monkeypatch.setattr(
+        "requests.Session.get_adapter", lambda _session, url: adapter
+    )
+
+    return adapter.routes
+
+
+@pytest.fixture(scope="function")
+def mocked_api(fast_http):
+    """
+    Register the mocked API endpoints shared by most tests and return the
+    route table. Tests can override or add a single endpoint by assigning
+    it in the route table.
+    """
+    fast_http.update(MOCKED_API_ROUTES)
+
+    return fast_http
@@ -1,8 +1,81 @@
 """
 dpres_access_rest_api_client.cli tests
 """
+import re
 from urllib.parse import urlencode
 
+import pytest
+
+from .access_api_mocks import (
+    API_URL, DIP_CONTENT, INGEST_REPORTS_URL, ingest_report_url, json_body
+)
+
+NOT_FOUND_DIP_URL = f"{API_URL}/disseminated/not_found_dip"
+
+DEFAULT_SEARCH_URL = (
+    f"{API_URL}/search?"
+    f"{urlencode({'page': 1, 'limit': 1000, 'q': 'pkg_type:AIP'})}"
+)
+EGGS_SEARCH_URL = (
+    f"{API_URL}/search?"
+    f"{urlencode({'page': 1, 'limit': 1000, 'q': 'mets_OBJID:eggs'})}"
+)
+
+SPAM_SEARCH_RESULT = {
+    "location": "/api/2.0/urn:uuid:fake_contract_id/preserved/spam",
+    "createdate": "2021-08-01T08:59:05Z",
+    "id": "spam",
+    "pkg_type": "AIP"
+}
+EGGS_SEARCH_RESULT = {
+    "location": "/api/2.0/urn:uuid:fake_contract_id/preserved/eggs",
+    "createdate": "2021-08-02T09:01:58Z",
+    "lastmoddate": "2021-08-03T09:01:58Z",
+    "id": "eggs",
+    "pkg_type": "AIP"
+}
+
+
+def _search_response(*results):
+    """
+    Return mocked response arguments for a search response containing the
+    given results
+    """
+    return json_body({
+        "status": "success",
+        "data": {
+            "results": list(results),
+            "links": {
+                "self": "/"
+            }
+        }
+    })
+
+
+# Search responses are serialized only once instead of on every request
+DEFAULT_SEARCH_RESPONSE = _search_response(
+    SPAM_SEARCH_RESULT, EGGS_SEARCH_RESULT
+)
+EGGS_SEARCH_RESPONSE = _search_response(EGGS_SEARCH_RESULT)
+
+# ID, package type, creation date and modification date are shown in that
+# order on the same row
+SPAM_ROW_RE = re.compile(r"spam +AIP +2021-08-01T08:59:05Z +N/A")
+EGGS_ROW_RE = re.compile(
+    r"eggs +AIP +2021-08-02T09:01:58Z +2021-08-03T09:01:58Z"
+)
+
+EXPECTED_INGEST_REPORT_LIST_OUTPUT = (
+    "2022-01-01 00:00:00+00:00",
+    "2022-01-02 00:00:00+00:00",
+    "2022-01-03 00:00:00+00:00",
+    "accepted",
+    "rejected",
+    "fake_transfer_id_1",
+    "fake_transfer_id_2",
+    "fake_transfer_id_3"
+)
+
 
 def test_help(cli_runner):
     """
@@ -12,190 +85,76 @@ def test_help(cli_runner):
 
     # Commands are listed in the help output
     commands = ["dip", "ingest-report", "search", "write-config"]
-    for command in commands:
-        assert command in result.output
+    missing = [
+        command for command in commands if command not in result.output
+    ]
+    assert not missing, missing
 
 
 def test_write_config(cli_runner, home_config_path):
     """
     Test that `write-config` creates the configuration file
     """
-    # Remove the existing file and ensure it is regenerated
-    home_config_path.unlink()
+    assert not home_config_path.exists()
 
     result = cli_runner(["write-config"])
 
     assert f"Configuration file written to {home_config_path}" in result.output
     assert home_config_path.is_file()
-    assert "[dpres]" in home_config_path.read_text()
+    assert b"[dpres]" in home_config_path.read_bytes()
 
-    home_config_path.write_text("overwritten config")
+    home_config_path.write_bytes(b"overwritten config")
 
     # If the file exists, nothing is written at all
     result = cli_runner(["write-config"])
     assert "Configuration file already exists" in result.output
-    assert home_config_path.read_text() == "overwritten config"
+    assert home_config_path.read_bytes() == b"overwritten config"
 
 
-def test_search(cli_runner, requests_mock):
+@pytest.mark.parametrize(
+    ("cli_args", "search_url", "search_response", "result_count",
+     "expected_rows", "must_not_contain"),
+    [
+        # Default search query if user didn't provide one
+        (
+            ["search"], DEFAULT_SEARCH_URL, DEFAULT_SEARCH_RESPONSE, 2,
+            [SPAM_ROW_RE, EGGS_ROW_RE],
+            []
+        ),
+        (
+            ["search", "--query", "mets_OBJID:eggs"], EGGS_SEARCH_URL,
+            EGGS_SEARCH_RESPONSE, 1,
+            [EGGS_ROW_RE],
+            ["spam"]
+        )
+    ]
+)
+def test_search(
+        cli_runner, fast_http, cli_args, search_url, search_response,
+        result_count, expected_rows, must_not_contain):
     """
-    Test that a search can be performed
+    Test that a search can be performed with the default and a custom query
     """
-    qs_encoded = urlencode({
-        "page": 1,
-        "limit": 1000,
-        # Default search query if user didn't provide one
-        "q": "pkg_type:AIP"
-    })
-
-    requests_mock.get(
-        f"http://fakeapi/api/2.0/urn:uuid:fake_contract_id/"
-        f"search?{qs_encoded}",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "location": (
-                            "/api/2.0/urn:uuid:fake_contract_id/preserved/"
-                            "spam"
-                        ),
-                        "createdate": "2021-08-01T08:59:05Z",
-                        "id": "spam",
-                        "pkg_type": "AIP"
-                    },
-                    {
-                        "location": (
-                            "/api/2.0/urn:uuid:fake_contract_id/preserved/"
-                            "eggs"
-                        ),
-                        "createdate": "2021-08-02T09:01:58Z",
-                        "lastmoddate": "2021-08-03T09:01:58Z",
-                        "id": "eggs",
-                        "pkg_type": "AIP"
-                    }
-                ],
-                "links": {
-                    "self": "/"
-                }
-            }
-        }
-    )
+    fast_http[("GET", search_url)] = search_response
 
-    result = cli_runner(["search"])
+    result = cli_runner(cli_args)
     output = result.output
 
-    assert "Displaying page 1 with 2 results" in output
+    assert f"Displaying page 1 with {result_count} results" in output
 
-    assert "spam" in output
-    assert "2021-08-01T08:59:05Z" in output
-    assert "N/A" in output
+    for row_re in expected_rows:
+        assert row_re.search(output)
 
-    # ID, package type, creation date and modification date
-    # are shown in that order
-    assert output.index("AIP") > output.index("spam")
-    assert output.index("2021-08-01T08:59:05Z") > output.index("AIP")
-    assert output.index("N/A") > output.index("2021-08-01T08:59:05Z")
+    for substring in must_not_contain:
+        assert substring not in output
 
-    assert "eggs" in output
 
-
-def test_search_query(cli_runner, requests_mock):
-    """
-    Test performing a search with a custom query
-    """
-    qs_encoded = urlencode({"page": 1, "limit": 1000, "q": "mets_OBJID:eggs"})
-
-    requests_mock.get(
-        f"http://fakeapi/api/2.0/urn:uuid:fake_contract_id/"
-        f"search?{qs_encoded}",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "location": (
-                            "/api/2.0/urn:uuid:fake_contract_id/preserved/"
-                            "eggs"
-                        ),
-                        "createdate": "2021-08-02T09:01:58Z",
-                        "lastmoddate": "2021-08-03T09:01:58Z",
-                        "id": "eggs",
-                        "pkg_type": "AIP"
-                    }
-                ],
-                "links": {
-                    "self": "/"
-                }
-            }
-        }
-    )
-
-    result = cli_runner(["search", "--query", "mets_OBJID:eggs"])
-    output = result.output
-
-    assert "eggs" in output
-    assert "spam" not in output
-
-
-def test_download(cli_runner, requests_mock, testpath):
+@pytest.mark.usefixtures("mocked_api")
+def test_download(cli_runner, tmp_path):
     """
     Test downloading a DIP using the `download` command
     """
-    requests_mock.post(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/preserved/spam/"
-        "disseminate",
-        json={
-            "status": "success",
-            "data": {
-                "disseminated": (
-                    "/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-                    "spam_dip"
-                )
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "complete": "true",
-                "actions": {
-                    "download": (
-                        "/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-                        "spam_dip/download"
-                    )
-                }
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip/download",
-        content=b"This is a complete DIP in a ZIP sent in a blip",
-        headers={
-            # requests-mock does not generate a Content-Length header
-            # automatically
-            "Content-Length": "46"
-        }
-    )
-    requests_mock.delete(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "deleted": "true",
-            }
-        }
-    )
-
-    download_dir = testpath / "download"
-    download_dir.mkdir()
-
-    download_path = download_dir / "spam.zip"
+    download_path = tmp_path / "spam.zip"
 
     result = cli_runner([
         "dip", "download", "--path", str(download_path), "spam"
@@ -208,38 +167,25 @@ def test_download(cli_runner, requests_mock, testpath):
     assert "Downloading (46 Bytes)" in output
 
     assert download_path.is_file()
-    assert download_path.read_bytes() == \
-        b"This is a complete DIP in a ZIP sent in a blip"
+    assert download_path.read_bytes() == DIP_CONTENT
 
     # DIP deletion should default to True
     assert 'delete' in output
 
 
-def test_delete_dip_query(cli_runner, requests_mock):
+def test_delete_dip_query(cli_runner, mocked_api):
     """
     Test performing DIP deletion with both a successful deletion
     and an unsuccessful deletion.
     """
-    requests_mock.delete(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "deleted": "true",
-            }
-        }
-    )
-    requests_mock.delete(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "not_found_dip",
-        json={
+    mocked_api[("DELETE", NOT_FOUND_DIP_URL)] = {
+        "json": {
             "status": "success",
             "data": {
                 "deleted": "false",
             }
-        },
-    )
+        }
+    }
 
     # Successful deletion
     result = cli_runner(["dip", "delete", "spam_dip"])
@@ -253,69 +199,27 @@ def test_delete_dip_query(cli_runner, requests_mock):
     assert "DIP could not be deleted" in output
 
 
-def test_list_ingest_reports(cli_runner, requests_mock):
+@pytest.mark.usefixtures("mocked_api")
+def test_list_ingest_reports(cli_runner):
     """
     Test listing available ingest reports with 'ingest-report list' command.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "date": "2022-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_1?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_1?type=xml")
-                        },
-                        "id": "fake_transfer_id_1",
-                        "status": "accepted"
-                    },
-                    {
-                        "date": "2022-01-02T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_2?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_2?type=xml")
-                        },
-                        "id": "fake_transfer_id_2",
-                        "status": "rejected"
-                    }
-                ]
-            }
-        }
-    )
-
     result = cli_runner(["ingest-report", "list", "doi:fake_id"])
     output = result.output
 
-    assert "2022-01-01 00:00:00+00:00" in output
-    assert "2022-01-02 00:00:00+00:00" in output
-    assert "accepted" in output
-    assert "rejected" in output
-    assert "fake_transfer_id_1" in output
-    assert "fake_transfer_id_2" in output
+    missing = [
+        expected for expected in EXPECTED_INGEST_REPORT_LIST_OUTPUT
+        if expected not in output
+    ]
+    assert not missing, missing
 
 
-def test_no_ingest_reports(cli_runner, requests_mock):
+def test_no_ingest_reports(cli_runner, fast_http):
     """
     Test that CLI gives a sensible message when there are no ingest reports
     available.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        status_code=404
-    )
+    fast_http[("GET", INGEST_REPORTS_URL)] = {"status_code": 404}
 
     result = cli_runner(["ingest-report", "list", "doi:fake_id"])
     output = result.output
@@ -323,162 +227,60 @@ def test_no_ingest_reports(cli_runner, requests_mock):
     assert output == "No ingest reports found for SIP id 'doi:fake_id'\n"
 
 
-def test_no_ingest_report(cli_runner, requests_mock):
+@pytest.mark.parametrize(
+    ("file_type", "status_code", "content", "expected_output"),
+    [
+        ("html", 200, b"html ingest report", "html ingest report\n"),
+        ("xml", 200, b"xml ingest report", "xml ingest report\n"),
+        # Sensible message when the specified ingest report is not available
+        (
+            "html", 404, b"",
+            "No ingest report was found with given parameters\n"
+        )
+    ]
+)
+def test_get_ingest_report(
+        cli_runner, fast_http, file_type, status_code, content,
+        expected_output):
     """
-    Test that CLI gives a sensible message when a spesified ingest report is
-    not available.
+    Test getting an ingest report with the given file type, and that
+    the CLI gives a sensible message when the report is not available.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=html",
-        status_code=404
-    )
+    fast_http[("GET", ingest_report_url("fake_transfer_id", file_type))] = {
+        "status_code": status_code,
+        "content": content
+    }
 
     result = cli_runner(["ingest-report", "get", "doi:fake_id",
-                         "--transfer-id", "fake_transfer_id", "--file-type",
-                         "html"])
-
-    assert result.output == ("No ingest report was found with given "
-                             "parameters\n")
-
-
-def test_get_ingest_report_with_correct_file_type(cli_runner, requests_mock):
-    """
-    Test getting an ingest report with the correct file type.
-    """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=html",
-        content=b"html ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=xml",
-        content=b"xml ingest report"
-    )
-
-    html_report = cli_runner(["ingest-report", "get", "doi:fake_id",
-                              "--transfer-id", "fake_transfer_id",
-                              "--file-type", "html"])
-    assert html_report.output == "html ingest report\n"
-
-    xml_report = cli_runner(["ingest-report", "get", "doi:fake_id",
-                             "--transfer-id", "fake_transfer_id",
-                             "--file-type", "xml"])
-    assert xml_report.output == "xml ingest report\n"
-
-
-def test_get_ingest_report_without_specifying_report(cli_runner):
-    """
-    Test that calling 'ingest-report get' without setting --latest or
-    --transfer-id leads to an error.
-    """
-    result = cli_runner(["ingest-report", "get", "sip_id"])
-    assert "report has to be specified with either --latest" in result.output
-    assert result.exit_code != 0
+                         "--transfer-id", "fake_transfer_id",
+                         "--file-type", file_type])
 
+    assert result.output == expected_output
 
-def test_get_ingest_report_with_conflicting_report_specification(cli_runner):
-    """
-    Test that calling 'ingest-report get' with both --latest and --transfer-id
-    leads to an error.
-    """
-    result = cli_runner(["ingest-report", "get", "sip_id", "--latest",
-                         "--transfer-id", "transfer_id"])
-    assert "Both --latest and --transfer-id provided" in result.output
-    assert result.exit_code != 0
 
-
-def test_getting_latest_ingest_report(cli_runner, requests_mock):
+@pytest.mark.usefixtures("mocked_api")
+def test_getting_latest_ingest_report(cli_runner):
     """
     Test that calling 'ingest-report get' with --latest flag returns
     the latest ingest report out of many options.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "date": "1980-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_1?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_1?type=xml")
-                        },
-                        "id": "fake_transfer_id_1",
-                        "status": "accepted"
-                    },
-                    {
-                        "date": "2000-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_2?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_2?type=xml")
-                        },
-                        "id": "fake_transfer_id_2",
-                        "status": "rejected"
-                    },
-                    {
-                        "date": "1990-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_3?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_3?type=xml")
-                        },
-                        "id": "fake_transfer_id_3",
-                        "status": "accepted"
-                    }
-                ]
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_1?type=html",
-        content=b"oldest ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_2?type=html",
-        content=b"latest ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_3?type=html",
-        content=b"old ingest report"
-    )
-
     result = cli_runner(["ingest-report", "get", "doi:fake_id", "--latest",
                          "--file-type", "html"])
     assert result.output == "latest ingest report\n"
 
 
-def test_save_ingest_report_to_path(cli_runner, requests_mock, testpath):
+def test_save_ingest_report_to_path(cli_runner, fast_http, tmp_path):
     """
     Test that ingest report is saved to the file system when a path is given.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=html",
-        content=b"html ingest report"
-    )
+    fast_http[("GET", ingest_report_url("fake_transfer_id", "html"))] = {
+        "content": b"html ingest report"
+    }
 
-    download_path = testpath / "ingest_report.html"
+    download_path = tmp_path / "ingest_report.html"
     result = cli_runner(["ingest-report", "get", "doi:fake_id",
                          "--transfer-id", "fake_transfer_id", "--file-type",
-                         "html", "--path", download_path])
+                         "html", "--path", str(download_path)])
 
     assert result.output == f"Ingest report saved to {download_path}\n"
 
@@ -0,0 +1,27 @@
+"""
+dpres_access_rest_api_client.cli argument validation tests.
+
+These tests only exercise Click's argument handling and never reach the
+API, so they do not use any of the HTTP mocking fixtures.
+"""
+
+
+def test_get_ingest_report_without_specifying_report(cli_runner):
+    """
+    Test that calling 'ingest-report get' without setting --latest or
+    --transfer-id leads to an error.
+    """
+    result = cli_runner(["ingest-report", "get", "sip_id"])
+    assert "report has to be specified with either --latest" in result.output
+    assert result.exit_code != 0
+
+
+def test_get_ingest_report_with_conflicting_report_specification(cli_runner):
+    """
+    Test that calling 'ingest-report get' with both --latest and --transfer-id
+    leads to an error.
+    """
+    result = cli_runner(["ingest-report", "get", "sip_id", "--latest",
+                         "--transfer-id", "transfer_id"])
+    assert "Both --latest and --transfer-id provided" in result.output
+    assert result.exit_code != 0
@@ -1,53 +1,66 @@
 """
 dpres_access_rest_api_client.client tests
 """
+import itertools
 import math
+import random
 from datetime import datetime, timezone
 
 import pytest
 
 import dpres_access_rest_api_client.client
-
-
-def test_dip_request(testpath, client, requests_mock):
+from .access_api_mocks import (
+    DIP_CONTENT, DIP_URL, INGEST_REPORTS_URL, ingest_report_url,
+    ingest_reports_response, json_body
+)
+
+DIP_NOT_READY_RESPONSE = json_body({
+    "status": "success",
+    "data": {
+        "complete": "false",
+        "actions": {}
+    }
+})
+
+TWO_INGEST_REPORTS_RESPONSE = ingest_reports_response(
+    ("fake_transfer_id_1", "2022-01-01T00:00:00Z", "accepted"),
+    ("fake_transfer_id_2", "2022-01-02T00:00:00Z", "rejected")
+)
+# Same reports with the UTC offset written out instead of 'Z'
+TWO_INGEST_REPORTS_OFFSET_RESPONSE = ingest_reports_response(
+    ("fake_transfer_id_1", "2022-01-01T00:00:00+00:00", "accepted"),
+    ("fake_transfer_id_2", "2022-01-02T00:00:00+00:00", "rejected")
+)
+# Entries returned by the client for both of the above responses, newest
+# first
+TWO_INGEST_REPORT_ENTRIES = [
+    {
+        "date": datetime(2022, 1, 2, tzinfo=timezone.utc),
+        "transfer_id": "fake_transfer_id_2",
+        "status": "rejected"
+    },
+    {
+        "date": datetime(2022, 1, 1, tzinfo=timezone.utc),
+        "transfer_id": "fake_transfer_id_1",
+        "status": "accepted"
+    }
+]
+THREE_INGEST_REPORTS_RESPONSE = ingest_reports_response(
+    ("fake_transfer_id_1", "1980-01-01T00:00:00Z", "accepted"),
+    ("fake_transfer_id_2", "2000-01-01T00:00:00Z", "rejected"),
+    ("fake_transfer_id_3", "1990-01-01T00:00:00Z", "accepted")
+)
+
+
+def test_dip_request(tmp_path, client, mocked_api):
     """
     Test downloading a DIP using the AccessClient methods
     """
-    download_path = testpath / "spam.zip"
-    requests_mock.post(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/preserved/spam/"
-        "disseminate",
-        json={
-            "status": "success",
-            "data": {
-                "disseminated": (
-                    "/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-                    "spam_dip"
-                )
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "complete": "false",
-                "actions": {}
-            }
-        }
-    )
-    requests_mock.delete(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "deleted": "true",
-            }
-        }
-    )
+    download_path = tmp_path / "spam.zip"
+
+    # The DIP is not ready on the first poll request
+    dip_ready_route = mocked_api[("GET", DIP_URL)]
+    mocked_api[("GET", DIP_URL)] = DIP_NOT_READY_RESPONSE
 
     dip_request = client.create_dip_request("spam", archive_format="zip")
 
@@ -55,49 +68,22 @@ def test_dip_request(testpath, client, requests_mock):
     assert not dip_request.check_status()
     assert not dip_request.ready
 
-    with pytest.raises(ValueError) as exc:
+    with pytest.raises(ValueError,
+                       match=r"^DIP is not ready for download yet$"):
         dip_request.download(download_path)
-    assert str(exc.value) == "DIP is not ready for download yet"
 
     # Perform delete DIP request; DIP cannot be deleted yet
-    with pytest.raises(ValueError) as exc:
+    with pytest.raises(ValueError, match=r"^DIP is not ready for deletion$"):
         dip_request.delete()
-    assert str(exc.value) == "DIP is not ready for deletion"
-
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip",
-        json={
-            "status": "success",
-            "data": {
-                "complete": "true",
-                "actions": {
-                    "download": (
-                        "/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-                        "spam_dip/download"
-                    )
-                }
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/disseminated/"
-        "spam_dip/download",
-        content=b"This is a complete DIP in a ZIP sent in a blip",
-        headers={
-            # requests-mock does not generate a Content-Length header
-            # automatically
-            "Content-Length": "46"
-        }
-    )
 
-    # Second poll reuest; DIP is now ready
+    mocked_api[("GET", DIP_URL)] = dip_ready_route
+
+    # Second poll request; DIP is now ready
     assert dip_request.check_status()
     dip_request.download(download_path)
 
     assert download_path.is_file()
-    assert download_path.read_bytes() == \
-        b"This is a complete DIP in a ZIP sent in a blip"
+    assert download_path.read_bytes() == DIP_CONTENT
 
     # DIP deletion should now return True
     delete_request = dip_request.delete()
@@ -112,108 +98,119 @@ def test_host_change(client):
 
 def test_poll_interval_iter():
     """
-    Test that poll interval iterator returns poll intervals in the expected
-    range
+    Test that poll interval iterator returns the expected poll intervals
     """
-    poll_interval_iter \
-        = dpres_access_rest_api_client.client.get_poll_interval_iter()
-
-    for _ in range(0, 5):
-        # First five are 3 seconds with 0.5s of jitter
-        assert math.isclose(next(poll_interval_iter), 3, abs_tol=0.5)
+    # First five are 3 seconds, second five are 10 seconds and the last
+    # value of 60 seconds is repeated forever. Each has up to 0.5s of jitter.
+    schedule = [3] * 5 + [10] * 5 + [60] * 10
+
+    # Seed the generator so that the jitter is reproducible
+    jitter_rng = random.Random(0)
+    expected = [
+        interval + jitter_rng.random() * 0.5 for interval in schedule
+    ]
 
-    for _ in range(0, 5):
-        # Second five are 10 seconds...
-        assert math.isclose(next(poll_interval_iter), 10, abs_tol=0.5)
+    intervals = list(itertools.islice(
+        dpres_access_rest_api_client.client.get_poll_interval_iter(
+            rng=random.Random(0)
+        ),
+        len(schedule)
+    ))
 
-    for _ in range(0, 10):
-        # ..and the last value of 60 seconds is repeated forever
-        assert math.isclose(next(poll_interval_iter), 60, abs_tol=0.5)
+    assert intervals == pytest.approx(expected, abs=0.001)
 
 
-def test_get_ingest_report_entries(client, requests_mock):
+def test_poll_interval_iter_default_rng():
+    """
+    Test that poll interval iterator adds at most 0.5s of jitter when using
+    the default random generator
+    """
+    schedule = [3] * 5 + [10] * 5 + [60] * 10
+    intervals = list(itertools.islice(
+        dpres_access_rest_api_client.client.get_poll_interval_iter(),
+        len(schedule)
+    ))
+
+    assert all(
+        math.isclose(interval, expected_interval, abs_tol=0.5)
+        for interval, expected_interval in zip(intervals, schedule)
+    ), intervals
+
+
+@pytest.mark.parametrize(
+    "response",
+    [TWO_INGEST_REPORTS_RESPONSE, TWO_INGEST_REPORTS_OFFSET_RESPONSE],
+    ids=["utc-z", "utc-offset"]
+)
+def test_get_ingest_report_entries(client, fast_http, response):
     """
     Test that list of ingest report entries are returned for given sip_id
     in correctly modified form: download key is removed, date converted
     to datetime and reports are sorted by date, newest report being the first
     in the list.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "date": "2022-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_1?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_1?type=xml")
-                        },
-                        "id": "fake_transfer_id_1",
-                        "status": "accepted"
-                    },
-                    {
-                        "date": "2022-01-02T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_2?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_2?type=xml")
-                        },
-                        "id": "fake_transfer_id_2",
-                        "status": "rejected"
-                    }
-                ]
-            }
-        }
-    )
-    correct_result = [
-        {
-            "date": datetime(2022, 1, 2, tzinfo=timezone.utc),
-            "transfer_id": "fake_transfer_id_2",
-            "status": "rejected"
-        },
-        {
-            "date": datetime(2022, 1, 1, tzinfo=timezone.utc),
-            "transfer_id": "fake_transfer_id_1",
-            "status": "accepted"
-        }
-    ]
+    fast_http[("GET", INGEST_REPORTS_URL)] = response
 
     received_entries = client.get_ingest_report_entries("doi:fake_id")
-    assert received_entries == correct_result
+    assert received_entries == TWO_INGEST_REPORT_ENTRIES
+
+
+@pytest.mark.parametrize(
+    "get_reports",
+    [
+        lambda client: client.get_ingest_report_entries("doi:fake_id"),
+        lambda client: client.get_latest_ingest_report("doi:fake_id", "html")
+    ],
+    ids=["entries", "latest"]
+)
+@pytest.mark.parametrize(
+    "date",
+    [
+        # Not in UTC
+        "2022-01-01T01:00:00+02:00",
+        # Wrong separators
+        "2022/01/01 00:00:00Z",
+        # Trailing garbage
+        "2022-01-01T00:00:00garbage",
+        # Fractional seconds
+        "2022-01-01T00:00:00.999Z"
+    ]
+)
+def test_get_ingest_report_entries_invalid_date(
+        client, fast_http, get_reports, date):
+    """
+    Test that an ingest report date that is not a UTC timestamp in the
+    expected format raises ValueError, both when listing the reports and
+    when looking for the latest report
+    """
+    fast_http[("GET", INGEST_REPORTS_URL)] = ingest_reports_response(
+        ("fake_transfer_id_1", date, "accepted"),
+        ("fake_transfer_id_2", "2022-01-01T00:30:00Z", "accepted")
+    )
+
+    with pytest.raises(ValueError):
+        get_reports(client)
 
 
-def test_get_ingest_report(client, requests_mock):
+@pytest.mark.parametrize(
+    ("file_type", "content"),
+    [
+        ("html", b"html ingest report"),
+        ("xml", b"xml ingest report")
+    ]
+)
+def test_get_ingest_report(client, fast_http, file_type, content):
     """
     Test that ingest report is returned for given id with correct file type
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=html",
-        content=b"html ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=xml",
-        content=b"xml ingest report"
-    )
+    fast_http[("GET", ingest_report_url("fake_transfer_id", file_type))] = {
+        "content": content
+    }
 
-    html_report = client.get_ingest_report("doi:fake_id", "fake_transfer_id",
-                                           "html")
-    xml_report = client.get_ingest_report("doi:fake_id", "fake_transfer_id",
-                                          "xml")
+    report = client.get_ingest_report("doi:fake_id", "fake_transfer_id",
+                                      file_type)
 
-    assert html_report == b"html ingest report"
-    assert xml_report == b"xml ingest report"
+    assert report == content
 
 
 def test_invalid_ingest_report_file_type(client):
@@ -221,126 +218,57 @@ def test_invalid_ingest_report_file_type(client):
     Test that trying to get ingest report with an invalid file type raises
     ValueError
     """
-    with pytest.raises(ValueError) as error:
+    with pytest.raises(ValueError,
+                       match="Invalid file type 'invalid_file_type'"):
         client.get_ingest_report("sip_id", "transfer_id", "invalid_file_type")
-    assert "Invalid file type 'invalid_file_type'" in str(error.value)
 
 
-def test_get_latest_ingest_report(client, requests_mock):
+def test_get_latest_ingest_report(client, fast_http):
     """
     Test that the latest ingest report is returned when there exists many
     ingest reports for a package.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        json={
-            "status": "success",
-            "data": {
-                "results": [
-                    {
-                        "date": "1980-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_1?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_1?type=xml")
-                        },
-                        "id": "fake_transfer_id_1",
-                        "status": "accepted"
-                    },
-                    {
-                        "date": "2000-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_2?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_2?type=xml")
-                        },
-                        "id": "fake_transfer_id_2",
-                        "status": "rejected"
-                    },
-                    {
-                        "date": "1990-01-01T00:00:00Z",
-                        "download": {
-                            "html": ("/api/2.0/urn:uuid:fake_contract_id"
-                                     "/ingest/report/doi:fake_id/"
-                                     "fake_transfer_id_3?type=html"),
-                            "xml": ("/api/2.0/urn:uuid:fake_contract_id"
-                                    "/ingest/report/doi:fake_id/"
-                                    "fake_transfer_id_3?type=xml")
-                        },
-                        "id": "fake_transfer_id_3",
-                        "status": "accepted"
-                    }
-                ]
-            }
-        }
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_1?type=html",
-        content=b"oldest ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_2?type=html",
-        content=b"latest ingest report"
-    )
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id_3?type=html",
-        content=b"old ingest report"
-    )
+    fast_http[("GET", INGEST_REPORTS_URL)] = THREE_INGEST_REPORTS_RESPONSE
+    # Only the latest report is registered; requesting any other report
+    # fails with a ConnectionError
+    fast_http[("GET", ingest_report_url("fake_transfer_id_2", "html"))] = {
+        "content": b"latest ingest report"
+    }
 
     report = client.get_latest_ingest_report("doi:fake_id", "html")
     assert report == b"latest ingest report"
 
 
-def test_no_latest_ingest_report(client, requests_mock):
+def test_no_latest_ingest_report(client, fast_http):
     """
     Test that if there are no ingest reports when trying to get the latest
     report, None is returned.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        status_code=404
-    )
+    fast_http[("GET", INGEST_REPORTS_URL)] = {"status_code": 404}
 
     report = client.get_latest_ingest_report("doi:fake_id", "html")
     assert report is None
 
 
-def test_no_ingest_report(client, requests_mock):
+def test_no_ingest_report(client, fast_http):
     """
     Test that if there is no ingest report with given ids, None is returned.
     """
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id/fake_transfer_id?type=html",
-        status_code=404
-    )
+    fast_http[("GET", ingest_report_url("fake_transfer_id", "html"))] = {
+        "status_code": 404
+    }
 
     report = client.get_ingest_report("doi:fake_id", "fake_transfer_id",
                                       "html")
     assert report is None
 
 
-def test_no_ingest_reports(client, requests_mock):
+def test_no_ingest_reports(client, fast_http):
     """
     Test that if there are no ingest reports for a SIP, empty list is returned.
     """
     # When there are no available ingest reports, access-rest-api returns 404
-    requests_mock.get(
-        "http://fakeapi/api/2.0/urn:uuid:fake_contract_id/ingest/report/"
-        "doi%3Afake_id",
-        status_code=404
-    )
+    fast_http[("GET", INGEST_REPORTS_URL)] = {"status_code": 404}
 
     received_entries = client.get_ingest_report_entries("doi:fake_id")
     assert received_entries == []